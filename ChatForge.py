@@ -1,10 +1,17 @@
 import sys
 import traceback
 import os
+import logging
+import bisect
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import NamedTuple
 
 try:
     import json
     import requests
+    from requests.adapters import HTTPAdapter
     import re
     import markdown
     from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -12,10 +19,11 @@ try:
                                 QLabel, QComboBox, QScrollArea, QFrame, QToolButton,
                                 QSizePolicy, QSpacerItem, QDialog, QMenu, QAction, QTreeWidget, 
                                 QTreeWidgetItem, QTextBrowser, QCheckBox)
-    from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QSize, QPropertyAnimation, 
-                            QRect, QPoint, QEasingCurve, QTimer)
+    from PyQt5.QtCore import (Qt, QObject, QThread, pyqtSignal, pyqtSlot, QSize, QPropertyAnimation, 
+                            QRect, QPoint, QEasingCurve, QTimer, QMutex, QMutexLocker, QWaitCondition)
     from PyQt5.QtGui import (QFont, QFontMetrics, QColor, QPalette, QIcon, QPixmap, 
-                            QPainter, QPainterPath, QTextCursor, QFontDatabase)
+                            QPainter, QPainterPath, QTextCursor, QTextBlockFormat, QTextCharFormat,
+                            QFontDatabase)
     print("Successfully imported all required modules")
 except ImportError as e:
     print(f"Error importing required module: {e}")
@@ -23,6 +31,24 @@ except ImportError as e:
     input("Press Enter to exit...")
     sys.exit(1)
 
+# Debug tracing goes through logging; only warnings and errors are shown by default
+logger = logging.getLogger(__name__)
+
+# Optional faster JSON parser for the streaming hot path (orjson and ujson accept bytes directly);
+# json_dumps always returns UTF-8 bytes ready to send as a request body
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    try:
+        import ujson
+        json_loads = ujson.loads
+        json_dumps = lambda obj: ujson.dumps(obj).encode('utf-8')
+    except ImportError:
+        json_loads = json.loads
+        json_dumps = lambda obj: json.dumps(obj).encode('utf-8')
+
 # Constants for styling - exact hex colors from the screenshot
 CHATGPT_BG = "#212121"  # Main background
 CHATGPT_USER_MSG_BG = "#343541"  # User message background
@@ -39,12 +65,372 @@ CHATGPT_BORDER_COLOR = "#565869"  # Border color
 BORDER_RADIUS = "16px"  # Increased border radius for more rounded corners
 FONT_FAMILY = "'Segoe UI', 'Open Sans', -apple-system, BlinkMacSystemFont, sans-serif"
 
+# Maximum number of messages kept in the conversation history, oldest dropped first
+CONVERSATION_HISTORY_SIZE = 64
+
+# Maximum number of hidden chat bubbles of each kind kept for reuse
+BUBBLE_POOL_SIZE = 32
+
+# Maximum number of cached bot message heights, keyed by (text hash, width)
+HEIGHT_CACHE_SIZE = 4096
+
+# Configuration file for the system prompt and streaming settings
+CONFIG_FILE = 'ollama_config.json'
+
+# HTTP session - reuses keep-alive connections to the Ollama API across requests
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+HTTP_SESSION.headers["Connection"] = "keep-alive"
+JSON_HEADERS = {"Content-Type": "application/json"}
+GENERATE_TIMEOUT = (3, 60)  # Fail fast when Ollama is unreachable, allow slow generation
+
+# Streaming constants - pulls only the "response" string out of an NDJSON frame
+STREAM_RESPONSE_RE = re.compile(rb'"response"\s*:\s*"((?:[^"\\]|\\.)*)"')
+STREAM_READ_SIZE = 16384  # Bytes pulled from the socket per read while streaming
+STREAM_EMIT_INTERVAL = 0.016  # Emit coalesced chunks at most ~60 times per second
+STREAM_EMIT_CHARS = 256  # ...or as soon as this many characters are pending
+STREAM_BUFFER_HIGH_WATERMARK = 96  # Queued batches at which the reader waits for the GUI
+STREAM_BUFFER_WAIT_MS = 1000  # ...but never longer than this per wait, in case the GUI is gone
+STREAM_MIN_EMIT_CHARS = 1  # The first batch goes out as soon as any text arrives
+STREAM_EMIT_CHARS_GROWTH = 2  # Each batch doubles the size threshold, up to STREAM_EMIT_CHARS
+
+# Model name formatting constants - specific model families with proper capitalization
+MODEL_FAMILIES = {
+    'llama': 'Llama',
+    'mistral': 'Mistral',
+    'codellama': 'CodeLlama',
+    'wizardlm': 'WizardLM',
+    'wizard': 'Wizard',
+    'gemma': 'Gemma',
+    'falcon': 'Falcon',
+    'phi': 'Phi',
+    'stablelm': 'StableLM',
+    'tinyllama': 'TinyLlama',
+    'vicuna': 'Vicuna',
+    'nous': 'Nous',
+    'orca': 'Orca',
+    'yi': 'Yi',
+}
+MODEL_FAMILY_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, MODEL_FAMILIES)) + r')\b',  # Word boundary to match whole words
+    re.IGNORECASE
+)
+MODEL_FAMILY_NAMES_LOWER = frozenset(value.lower() for value in MODEL_FAMILIES.values())
+UNCENSORED_RE = re.compile(r'\buncensored\b', re.IGNORECASE)
+SIZE_RE = re.compile(r'(\d+(?:\.\d+)?[bB])')
+
+# System prompt template variables
+TEMPLATE_RE = re.compile(r'%(model|parameters)%')
+
+# Custom CSS for markdown - applied as the default stylesheet of each bot message document
+MARKDOWN_CSS = """
+    body {
+        font-family: 'Segoe UI', sans-serif;
+        font-size: 16px;
+        line-height: 1.6;
+        color: #FFFFFF;
+    }
+    pre {
+        background-color: #2D2D2D;
+        border-radius: 5px;
+        padding: 10px;
+        overflow-x: auto;
+    }
+    code {
+        font-family: 'Consolas', monospace;
+        background-color: #2D2D2D;
+        padding: 2px 4px;
+        border-radius: 3px;
+    }
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        margin: 10px 0;
+    }
+    th, td {
+        border: 1px solid #444;
+        padding: 8px;
+        text-align: left;
+    }
+    th {
+        background-color: #333;
+    }
+    a {
+        color: #3390FF;
+        text-decoration: none;
+    }
+    a:hover {
+        text-decoration: underline;
+    }
+    blockquote {
+        border-left: 4px solid #444;
+        margin-left: 0;
+        padding-left: 15px;
+        color: #BBB;
+    }
+    img {
+        max-width: 100%;
+        height: auto;
+    }
+    h1, h2, h3, h4, h5, h6 {
+        margin-top: 20px;
+        margin-bottom: 10px;
+        font-weight: 600;
+    }
+    ol, ul {
+        padding-left: 20px;
+    }
+"""
+
+# Application-wide stylesheet - formatted once at import time and applied to the
+# QApplication, with widgets selected by object name
+APP_STYLESHEET = f"""
+    QMainWindow, QWidget {{
+        background-color: {CHATGPT_BG};
+        color: {CHATGPT_TEXT_COLOR};
+        font-family: {FONT_FAMILY};
+    }}
+
+    QScrollArea {{
+        border: none;
+        background-color: {CHATGPT_BG};
+    }}
+
+    QScrollBar:vertical {{
+        background-color: {CHATGPT_BG};
+        width: 8px;
+        margin: 0px;
+    }}
+
+    QScrollBar::handle:vertical {{
+        background-color: #555555;
+        min-height: 30px;
+        border-radius: 4px;
+    }}
+
+    QScrollBar::handle:vertical:hover {{
+        background-color: #777777;
+    }}
+
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+        height: 0px;
+    }}
+
+    /* Header */
+    QWidget#header, QWidget#input_container {{
+        background-color: {CHATGPT_BG};
+    }}
+    QLabel#header_title {{
+        font-weight: 600;
+        font-size: 18px;
+        color: {CHATGPT_TEXT_COLOR};
+        font-family: {FONT_FAMILY};
+        padding: 8px 14px;
+    }}
+    QToolButton#system_prompt_button {{
+        background-color: transparent;
+        border-radius: 8px;
+        padding: 6px;
+        color: {CHATGPT_SECONDARY_TEXT};
+        font-size: 16px;
+    }}
+    QToolButton#system_prompt_button:hover {{
+        background-color: rgba(255, 255, 255, 0.1);
+    }}
+
+    /* Welcome view */
+    QLabel#welcome_title {{
+        color: {CHATGPT_TEXT_COLOR};
+        font-size: 32px;
+        font-weight: 600;
+        font-family: {FONT_FAMILY};
+    }}
+
+    /* Input area */
+    QFrame#input_frame {{
+        background-color: {CHATGPT_INPUT_BG};
+        border-radius: {BORDER_RADIUS};
+        border: 1px solid #424242;
+    }}
+    QPlainTextEdit#message_input {{
+        background-color: transparent;
+        border: none;
+        color: {CHATGPT_TEXT_COLOR};
+        font-size: 16px;
+        padding: 0px;
+        font-family: {FONT_FAMILY};
+    }}
+    QPlainTextEdit#message_input:focus {{
+        outline: none;
+    }}
+    QWidget#button_row {{
+        background-color: transparent;
+    }}
+    QToolButton#plus_button, QToolButton#search_button {{
+        background-color: transparent;
+        border-radius: 8px;
+        padding: 6px;
+        color: {CHATGPT_SECONDARY_TEXT};
+        font-size: 14px;
+    }}
+    QToolButton#plus_button:hover, QToolButton#search_button:hover {{
+        background-color: rgba(255, 255, 255, 0.1);
+    }}
+    QToolButton#send_button {{
+        background-color: {CHATGPT_ACCENT};
+        border-radius: 12px;
+        padding: 8px;
+        color: #000000;
+        font-weight: bold;
+    }}
+    QToolButton#send_button:hover {{
+        background-color: #E0E0E0;
+    }}
+    QLabel#disclaimer {{
+        color: {CHATGPT_PLACEHOLDER};
+        font-size: 12px;
+        text-align: center;
+        font-family: {FONT_FAMILY};
+    }}
 
-class OllamaThread(QThread):
-    """Thread for handling Ollama API requests without blocking the UI"""
+    /* Chat bubbles */
+    QLabel#user_message {{
+        background-color: transparent;
+        color: {CHATGPT_TEXT_COLOR};
+        font-family: {FONT_FAMILY};
+        font-size: 16px;
+        border: none;
+    }}
+    QTextEdit#bot_message {{
+        background-color: transparent;
+        color: {CHATGPT_TEXT_COLOR};
+        font-family: {FONT_FAMILY};
+        font-size: 16px;
+        border: none;
+        selection-color: white;
+        selection-background-color: #3390FF;
+    }}
+    QToolButton#bubble_button {{
+        background-color: transparent;
+        border: none;
+        color: {CHATGPT_SECONDARY_TEXT};
+        padding: 0px;
+        font-size: 14px;
+    }}
+    QToolButton#bubble_button:hover {{
+        background-color: rgba(255, 255, 255, 0.1);
+        border-radius: 4px;
+    }}
+
+    /* Command prediction popup */
+    QFrame#command_popup, #command_popup QLabel {{
+        background-color: {CHATGPT_INPUT_BG};
+        border: 1px solid #424242;
+        border-radius: 8px;
+    }}
+    #command_popup QLabel {{
+        color: {CHATGPT_TEXT_COLOR};
+        font-size: 14px;
+        font-weight: bold;
+        padding: 4px 8px;
+    }}
+    #command_popup QLabel:hover {{
+        background-color: rgba(255, 255, 255, 0.1);
+        border-radius: 4px;
+    }}
+
+    /* Model selection and system prompt dialogs */
+    QDialog#model_dialog, QDialog#system_prompt_dialog {{
+        background-color: {CHATGPT_BG};
+        color: {CHATGPT_TEXT_COLOR};
+        border-radius: {BORDER_RADIUS};
+        font-family: {FONT_FAMILY};
+    }}
+    #model_dialog QLabel, #system_prompt_dialog QLabel {{
+        color: {CHATGPT_TEXT_COLOR};
+        font-size: 14px;
+        font-weight: 500;
+    }}
+    #model_dialog QComboBox, #model_dialog QLineEdit {{
+        background-color: {CHATGPT_INPUT_BG};
+        color: {CHATGPT_TEXT_COLOR};
+        border-radius: 12px;
+        border: 1px solid #424242;
+        padding: 8px 12px;
+        min-height: 40px;
+        font-size: 14px;
+        font-family: {FONT_FAMILY};
+    }}
+    #model_dialog QPushButton, #system_prompt_dialog QPushButton {{
+        background-color: {CHATGPT_ACCENT};
+        color: black;
+        border: none;
+        border-radius: 12px;
+        padding: 10px 16px;
+        font-weight: 600;
+        font-size: 14px;
+        font-family: {FONT_FAMILY};
+    }}
+    #model_dialog QPushButton:hover, #system_prompt_dialog QPushButton:hover {{
+        background-color: #E0E0E0;
+    }}
+    #model_dialog QListWidget, #model_dialog QTreeWidget {{
+        background-color: {CHATGPT_INPUT_BG};
+        color: {CHATGPT_TEXT_COLOR};
+        border-radius: 12px;
+        border: 1px solid #424242;
+        padding: 8px;
+        font-size: 14px;
+        font-family: {FONT_FAMILY};
+    }}
+    #model_dialog QListWidget::item {{
+        padding: 8px;
+        border-radius: 6px;
+    }}
+    #model_dialog QTreeWidget::item {{
+        padding: 6px;
+    }}
+    #model_dialog QListWidget::item:hover, #model_dialog QTreeWidget::item:hover {{
+        background-color: rgba(255, 255, 255, 0.1);
+    }}
+    #model_dialog QListWidget::item:selected, #model_dialog QTreeWidget::item:selected {{
+        background-color: rgba(255, 255, 255, 0.2);
+    }}
+    #model_dialog QTreeWidget::branch {{
+        background-color: transparent;
+    }}
+    #system_prompt_dialog QTextEdit {{
+        background-color: {CHATGPT_INPUT_BG};
+        color: {CHATGPT_TEXT_COLOR};
+        border-radius: 12px;
+        border: 1px solid #424242;
+        padding: 8px 12px;
+        font-size: 14px;
+        font-family: {FONT_FAMILY};
+    }}
+    #system_prompt_dialog QCheckBox {{
+        color: {CHATGPT_TEXT_COLOR};
+        font-size: 14px;
+    }}
+    #system_prompt_dialog QCheckBox::indicator {{
+        width: 18px;
+        height: 18px;
+        border: 2px solid {CHATGPT_SECONDARY_TEXT};
+        border-radius: 3px;
+    }}
+    #system_prompt_dialog QCheckBox::indicator:checked {{
+        background-color: {CHATGPT_ACCENT};
+        border: 2px solid {CHATGPT_ACCENT};
+    }}
+"""
+
+class OllamaWorker(QObject):
+    """Worker for handling Ollama API requests on a QThread without blocking the UI"""
     response_received = pyqtSignal(str)
-    streaming_chunk_received = pyqtSignal(str)
+    streaming_text_available = pyqtSignal()
     error_occurred = pyqtSignal(str)
+    finished = pyqtSignal()
     
     def __init__(self, model, prompt, api_url, system_prompt="", use_streaming=False):
         super().__init__()
@@ -54,6 +440,44 @@ class OllamaThread(QThread):
         self.system_prompt = system_prompt
         self.use_streaming = use_streaming
         
+        # Set from the GUI thread by cancel(); the open response is closed to free the socket
+        self.cancelled = False
+        self.response = None
+        
+        # Streamed text not yet taken by the GUI thread, guarded by stream_lock
+        self.stream_lock = QMutex()
+        self.stream_drained = QWaitCondition()
+        self.stream_buffer = []
+    
+    def push_stream_text(self, text):
+        """Queue streamed text for the GUI, signalling only when the buffer was empty"""
+        with QMutexLocker(self.stream_lock):
+            # Stop reading the socket while the GUI is behind, letting TCP push back on Ollama
+            while len(self.stream_buffer) >= STREAM_BUFFER_HIGH_WATERMARK and not self.cancelled:
+                if not self.stream_drained.wait(self.stream_lock, STREAM_BUFFER_WAIT_MS):
+                    break
+            
+            was_empty = not self.stream_buffer
+            self.stream_buffer.append(text)
+        
+        if was_empty:
+            self.streaming_text_available.emit()
+    
+    def take_stream_text(self):
+        """Remove and return all streamed text queued since the last call"""
+        with QMutexLocker(self.stream_lock):
+            text = ''.join(self.stream_buffer)
+            self.stream_buffer = []
+            self.stream_drained.wakeAll()
+        return text
+    
+    def cancel(self):
+        """Stop the request from the GUI thread, closing the response if one is open"""
+        self.cancelled = True
+        response = self.response
+        if response is not None:
+            response.close()
+        
     def process_system_prompt(self, model_display_name):
         """Process system prompt template variables"""
         if not self.system_prompt:
@@ -61,27 +485,31 @@ class OllamaThread(QThread):
         
         prompt = self.system_prompt
         
+        # Nothing to substitute without a template marker
+        if '%' not in prompt:
+            return prompt
+        
         # Extract model name and parameters
         model_info = format_model_name(self.model)
-        formatted_name = model_info['formatted_name']
-        param_count = extract_param_count(model_info['size_info'])
-        
-        # Replace template variables
-        prompt = prompt.replace("%model%", formatted_name)
-        prompt = prompt.replace("%parameters%", param_count)
+        template_values = {
+            'model': model_info.formatted_name,
+            'parameters': extract_param_count(model_info.size_info)
+        }
         
-        return prompt
+        # Replace template variables in a single pass
+        return TEMPLATE_RE.sub(lambda match: template_values[match.group(1)], prompt)
         
-    def run(self):
+    @pyqtSlot()
+    def start_request(self):
         try:
-            print(f"OllamaThread: Starting API request to {self.api_url}")
-            print(f"OllamaThread: Using model {self.model}")
+            logger.debug("OllamaWorker: Starting API request to %s", self.api_url)
+            logger.debug("OllamaWorker: Using model %s", self.model)
             
             # Get model display name for template processing
             model_info = format_model_name(self.model)
-            display_name = model_info['formatted_name']
-            if model_info['size_info']:
-                display_name += f" ({model_info['size_info']})"
+            display_name = model_info.formatted_name
+            if model_info.size_info:
+                display_name += f" ({model_info.size_info})"
             
             # Process system prompt templates
             processed_system_prompt = self.process_system_prompt(display_name)
@@ -95,69 +523,113 @@ class OllamaThread(QThread):
             
             # Add system prompt if provided
             if processed_system_prompt:
-                print(f"OllamaThread: Using system prompt: {processed_system_prompt[:30]}...")
+                logger.debug("OllamaWorker: Using system prompt: %s...", processed_system_prompt[:30])
                 payload["system"] = processed_system_prompt
             
-            print(f"OllamaThread: Sending request with streaming={self.use_streaming}...")
+            logger.debug("OllamaWorker: Sending request with streaming=%s...", self.use_streaming)
+            
+            # Serialize the payload once for whichever request is sent
+            body = json_dumps(payload)
             
             if self.use_streaming:
                 # Handle streaming response
-                full_response = ""
+                chunks = []
+                pending = []
+                pending_len = 0
+                emit_chars = STREAM_MIN_EMIT_CHARS
+                last_emit = time.monotonic()
                 
-                response = requests.post(
+                response = self.response = HTTP_SESSION.post(
                     f"{self.api_url}/api/generate",
-                    json=payload,
+                    data=body,
+                    headers=JSON_HEADERS,
                     stream=True,
-                    timeout=60
+                    timeout=GENERATE_TIMEOUT
                 )
                 
                 if response.status_code == 200:
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                chunk_data = json.loads(line)
-                                if 'response' in chunk_data:
-                                    chunk = chunk_data['response']
-                                    full_response += chunk
-                                    self.streaming_chunk_received.emit(chunk)
-                            except json.JSONDecodeError:
-                                print(f"Warning: Failed to parse JSON from line: {line}")
+                    for line in response.iter_lines(chunk_size=STREAM_READ_SIZE, decode_unicode=False):
+                        if self.cancelled:
+                            return
+                        
+                        # Skip keep-alive and partial frames - complete frames end with '}'
+                        if not line or line[-1:] not in (b'}', b']'):
+                            continue
+                        
+                        # Skip metadata frames without a response before running the regex
+                        if b'"response"' not in line:
+                            continue
+                        
+                        # Decode only the "response" string instead of the whole frame
+                        response_match = STREAM_RESPONSE_RE.search(line)
+                        if not response_match or not response_match.group(1):
+                            continue
+                        try:
+                            chunk = json_loads(b'"' + response_match.group(1) + b'"')
+                            chunks.append(chunk)
+                            pending.append(chunk)
+                            pending_len += len(chunk)
+                        except ValueError:
+                            # json, orjson and ujson decode errors all derive from ValueError
+                            logger.warning("Failed to parse JSON from line: %r", line)
+                            continue
+                        
+                        # Coalesce chunks to cut down on cross-thread signal deliveries
+                        now = time.monotonic()
+                        if now - last_emit >= STREAM_EMIT_INTERVAL or pending_len >= emit_chars:
+                            self.push_stream_text(''.join(pending))
+                            pending = []
+                            pending_len = 0
+                            last_emit = now
+                            emit_chars = min(emit_chars * STREAM_EMIT_CHARS_GROWTH, STREAM_EMIT_CHARS)
+                    
+                    # Flush any chunks still pending
+                    if pending:
+                        self.push_stream_text(''.join(pending))
                     
                     # Send the complete response at the end
-                    self.response_received.emit(full_response)
+                    self.response_received.emit(''.join(chunks))
                 else:
                     error_text = response.text
-                    print(f"OllamaThread: Error response: {error_text}")
+                    logger.warning("OllamaWorker: Error response: %s", error_text)
                     self.error_occurred.emit(f"Error: Status code {response.status_code} - {error_text}")
             else:
                 # Handle non-streaming response
-                response = requests.post(
+                response = HTTP_SESSION.post(
                     f"{self.api_url}/api/generate",
-                    json=payload,
-                    timeout=60
+                    data=body,
+                    headers=JSON_HEADERS,
+                    timeout=GENERATE_TIMEOUT
                 )
+                if self.cancelled:
+                    return
                 
-                print(f"OllamaThread: Response status code: {response.status_code}")
+                logger.debug("OllamaWorker: Response status code: %s", response.status_code)
                 
                 if response.status_code == 200:
                     data = response.json()
                     self.response_received.emit(data.get('response', 'No response content'))
                 else:
                     error_text = response.text
-                    print(f"OllamaThread: Error response: {error_text}")
+                    logger.warning("OllamaWorker: Error response: %s", error_text)
                     self.error_occurred.emit(f"Error: Status code {response.status_code} - {error_text}")
                     
         except requests.exceptions.RequestException as e:
-            print(f"OllamaThread: Request exception: {str(e)}")
+            if self.cancelled:
+                return
+            logger.error("OllamaWorker: Request exception: %s", e)
             self.error_occurred.emit(f"Network error: {str(e)}")
         except json.JSONDecodeError as e:
-            print(f"OllamaThread: JSON decode error: {str(e)}")
+            logger.error("OllamaWorker: JSON decode error: %s", e)
             self.error_occurred.emit(f"Invalid response format: {str(e)}")
         except Exception as e:
-            print(f"OllamaThread: Unexpected error: {str(e)}")
-            import traceback
+            if self.cancelled:
+                return
+            logger.error("OllamaWorker: Unexpected error: %s", e)
             traceback.print_exc()
             self.error_occurred.emit(f"Error: {str(e)}")
+        finally:
+            self.finished.emit()
 
 def extract_param_count(size_info):
     """Extract parameter count from size info (e.g., '7b' -> '7')"""
@@ -170,6 +642,15 @@ def extract_param_count(size_info):
     
     return size_info
 
+class ModelInfo(NamedTuple):
+    """Formatted model name information returned by format_model_name"""
+    formatted_name: str
+    size_info: str
+    original_name: str
+    base_family: str
+
+
+@lru_cache(maxsize=512)
 def format_model_name(name):
     """Format model name according to specified rules:
     - Remove everything before the last slash
@@ -193,45 +674,33 @@ def format_model_name(name):
         name = parts[0]
         
         # Look for size patterns like 7b, 13b, 1.5b in the part after the colon
-        size_match = re.search(r'(\d+(?:\.\d+)?[bB])', parts[1])
-        if size_match:
-            size_info = size_match.group(1)
+        # Fast path: the common tag format puts the size first, e.g. 13b-instruct-q4_0
+        suffix = parts[1]
+        dash_index = suffix.find('-')
+        head = suffix if dash_index < 0 else suffix[:dash_index]
+        if (len(head) >= 2 and head[-1] in 'bB' and head[0].isdecimal()
+                and head[-2].isdecimal() and head[:-1].replace('.', '', 1).isdecimal()):
+            size_info = head
+        else:
+            size_match = SIZE_RE.search(suffix)
+            if size_match:
+                size_info = size_match.group(1)
     
     # Replace - and _ with space
     name = name.replace('-', ' ').replace('_', ' ')
     
-    # Handle specific model families with proper capitalization
-    model_families = {
-        'llama': 'Llama',
-        'mistral': 'Mistral',
-        'codellama': 'CodeLlama',
-        'wizardlm': 'WizardLM',
-        'wizard': 'Wizard',
-        'gemma': 'Gemma',
-        'falcon': 'Falcon',
-        'phi': 'Phi',
-        'stablelm': 'StableLM',
-        'tinyllama': 'TinyLlama',
-        'vicuna': 'Vicuna',
-        'nous': 'Nous',
-        'orca': 'Orca',
-        'yi': 'Yi',
-    }
-    
     # Apply model family capitalization
-    for key, value in model_families.items():
-        pattern = r'\b' + key + r'\b'  # Word boundary to match whole words
-        name = re.sub(pattern, value, name, flags=re.IGNORECASE)
+    name = MODEL_FAMILY_RE.sub(lambda match: MODEL_FAMILIES[match.group(1).lower()], name)
     
     # Replace 'uncensored' with '(🗽)'
-    name = re.sub(r'\buncensored\b', '(🗽)', name, flags=re.IGNORECASE)
+    name = UNCENSORED_RE.sub('(🗽)', name)
     
     # Capitalize first letter of each word for remaining terms
     words = name.split()
     capitalized_words = []
     for word in words:
-        # Skip words that were already handled by model_families
-        if word.lower() in [v.lower() for v in model_families.values()] or word == '(🗽)':
+        # Skip words that were already handled by MODEL_FAMILIES
+        if word.lower() in MODEL_FAMILY_NAMES_LOWER or word == '(🗽)':
             capitalized_words.append(word)
         else:
             # Capitalize first letter of remaining words
@@ -242,12 +711,33 @@ def format_model_name(name):
     # Extract the base family name for grouping
     base_name = capitalized_words[0] if capitalized_words else ""
     
-    return {
-        'formatted_name': formatted_name,
-        'size_info': size_info,
-        'original_name': original_name,
-        'base_family': base_name
-    }
+    return ModelInfo(
+        formatted_name=formatted_name,
+        size_info=size_info,
+        original_name=original_name,
+        base_family=base_name
+    )
+
+
+class ModelListFetcher(QThread):
+    """Thread for fetching the model list from the Ollama API without blocking the dialog"""
+    models_ready = pyqtSignal(list)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, api_url):
+        super().__init__()
+        self.api_url = api_url
+    
+    def run(self):
+        try:
+            response = HTTP_SESSION.get(f"{self.api_url}/api/tags", timeout=5)
+            if response.status_code == 200:
+                models = response.json().get('models', [])
+                self.models_ready.emit([model['name'] for model in models])
+            else:
+                self.error_occurred.emit(f"Error: Status code {response.status_code}")
+        except Exception as e:
+            self.error_occurred.emit(f"Error: {str(e)}")
 
 
 class ModelSelectionDialog(QDialog):
@@ -257,97 +747,13 @@ class ModelSelectionDialog(QDialog):
         self.api_url = api_url
         self.selected_model = ""
         self.display_name = ""  # Store formatted display name
+        self.fetch_thread = None
         
         self.setWindowTitle("Select Model")
         self.setFixedSize(500, 400)  # Made dialog larger to accommodate groups
         
-        # Apply stylesheets
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {CHATGPT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: {BORDER_RADIUS};
-                font-family: {FONT_FAMILY};
-            }}
-            QLabel {{
-                color: {CHATGPT_TEXT_COLOR};
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            QComboBox {{
-                background-color: {CHATGPT_INPUT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: 12px;
-                border: 1px solid #424242;
-                padding: 8px 12px;
-                min-height: 40px;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QLineEdit {{
-                background-color: {CHATGPT_INPUT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: 12px;
-                border: 1px solid #424242;
-                padding: 8px 12px;
-                min-height: 40px;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton {{
-                background-color: {CHATGPT_ACCENT};
-                color: black;
-                border: none;
-                border-radius: 12px;
-                padding: 10px 16px;
-                font-weight: 600;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton:hover {{
-                background-color: #E0E0E0;
-            }}
-            QListWidget {{
-                background-color: {CHATGPT_INPUT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: 12px;
-                border: 1px solid #424242;
-                padding: 8px;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QListWidget::item {{
-                padding: 8px;
-                border-radius: 6px;
-            }}
-            QListWidget::item:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-            }}
-            QListWidget::item:selected {{
-                background-color: rgba(255, 255, 255, 0.2);
-            }}
-            QTreeWidget {{
-                background-color: {CHATGPT_INPUT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: 12px;
-                border: 1px solid #424242;
-                padding: 8px;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QTreeWidget::item {{
-                padding: 6px;
-            }}
-            QTreeWidget::item:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-            }}
-            QTreeWidget::item:selected {{
-                background-color: rgba(255, 255, 255, 0.2);
-            }}
-            QTreeWidget::branch {{
-                background-color: transparent;
-            }}
-        """)
+        # Styled by the application stylesheet
+        self.setObjectName("model_dialog")
         
         layout = QVBoxLayout(self)
         layout.setSpacing(16)
@@ -389,83 +795,105 @@ class ModelSelectionDialog(QDialog):
         # Fetch models on init
         self.fetch_models()
     
+    @pyqtSlot(QTreeWidgetItem, int)
     def model_selected(self, item, column):
         """Handle model selection from tree"""
         # Check if this is a model item (not a group)
         if hasattr(item, 'model_data'):
-            self.selected_model = item.model_data['original_name']
+            self.selected_model = item.model_data.original_name
             self.display_name = item.text(0)
     
+    @pyqtSlot()
     def fetch_models(self):
-        """Fetch available models from Ollama API and organize them by family"""
-        try:
-            self.api_url = self.api_url_input.text().strip()
-            self.model_tree.clear()
-            
-            # Add loading indicator
-            loading_item = QTreeWidgetItem(self.model_tree)
-            loading_item.setText(0, "Fetching models...")
-            self.model_tree.addTopLevelItem(loading_item)
+        """Fetch available models from Ollama API in a background thread"""
+        # Let an in-flight fetch finish instead of starting a second one
+        if self.fetch_thread is not None and self.fetch_thread.isRunning():
+            return
+        
+        self.api_url = self.api_url_input.text().strip()
+        self.model_tree.clear()
+        
+        # Add loading indicator
+        loading_item = QTreeWidgetItem(self.model_tree)
+        loading_item.setText(0, "Fetching models...")
+        self.model_tree.addTopLevelItem(loading_item)
+        
+        self.fetch_thread = ModelListFetcher(self.api_url)
+        self.fetch_thread.models_ready.connect(self.populate_models)
+        self.fetch_thread.error_occurred.connect(self.show_fetch_error)
+        self.fetch_thread.start()
+    
+    @pyqtSlot(list)
+    def populate_models(self, model_names):
+        """Organize fetched models by family and show them in the tree"""
+        # Clear the tree
+        self.model_tree.clear()
+        
+        if model_names:
+            # Group models by family
+            model_families = {}
             
-            response = requests.get(f"{self.api_url}/api/tags")
-            if response.status_code == 200:
-                models = response.json().get('models', [])
-                model_names = [model['name'] for model in models]
+            for name in model_names:
+                model_info = format_model_name(name)
+                base_family = model_info.base_family
+                
+                if base_family not in model_families:
+                    model_families[base_family] = []
                 
-                # Clear the tree
-                self.model_tree.clear()
+                model_families[base_family].append(model_info)
+            
+            # Build all items first and insert them in one batch - a single relayout
+            family_items = []
+            for family, models in sorted(model_families.items()):
+                # Create family group item
+                family_item = QTreeWidgetItem()
+                family_item.setText(0, family)
+                family_item.setFlags(family_item.flags() | Qt.ItemIsAutoTristate)
                 
-                if model_names:
-                    # Group models by family
-                    model_families = {}
+                # Add models to this family
+                model_items = []
+                for model_info in sorted(models, key=lambda x: x.formatted_name):
+                    model_item = QTreeWidgetItem()
                     
-                    for name in model_names:
-                        model_info = format_model_name(name)
-                        base_family = model_info['base_family']
-                        
-                        if base_family not in model_families:
-                            model_families[base_family] = []
-                        
-                        model_families[base_family].append(model_info)
+                    # Format display with optional size info
+                    display_text = model_info.formatted_name
+                    if model_info.size_info:
+                        # Add size info but without HTML formatting
+                        display_text = f"{display_text} ({model_info.size_info})"
                     
-                    # Add grouped models to tree
-                    for family, models in sorted(model_families.items()):
-                        # Create family group item
-                        family_item = QTreeWidgetItem(self.model_tree)
-                        family_item.setText(0, family)
-                        family_item.setFlags(family_item.flags() | Qt.ItemIsAutoTristate)
-                        family_item.setExpanded(True)  # Expand by default
-                        
-                        # Add models to this family
-                        for model_info in sorted(models, key=lambda x: x['formatted_name']):
-                            model_item = QTreeWidgetItem(family_item)
-                            
-                            # Format display with optional size info
-                            display_text = model_info['formatted_name']
-                            if model_info['size_info']:
-                                # Add size info but without HTML formatting
-                                display_text = f"{display_text} ({model_info['size_info']})"
-                            
-                            # Set plain text instead of HTML
-                            model_item.setText(0, display_text)
-                            
-                            # Store original model data for later use
-                            model_item.model_data = model_info
-                else:
-                    empty_item = QTreeWidgetItem(self.model_tree)
-                    empty_item.setText(0, "No models found")
-                    self.model_tree.addTopLevelItem(empty_item)
-            else:
-                self.model_tree.clear()
-                error_item = QTreeWidgetItem(self.model_tree)
-                error_item.setText(0, f"Error: Status code {response.status_code}")
-                self.model_tree.addTopLevelItem(error_item)
-        except Exception as e:
-            self.model_tree.clear()
-            error_item = QTreeWidgetItem(self.model_tree)
-            error_item.setText(0, f"Error: {str(e)}")
-            self.model_tree.addTopLevelItem(error_item)
+                    # Set plain text instead of HTML
+                    model_item.setText(0, display_text)
+                    
+                    # Store original model data for later use
+                    model_item.model_data = model_info
+                    model_items.append(model_item)
+                
+                family_item.addChildren(model_items)
+                family_items.append(family_item)
+            
+            # Add grouped models to tree
+            self.model_tree.setUpdatesEnabled(False)
+            self.model_tree.blockSignals(True)
+            try:
+                self.model_tree.addTopLevelItems(family_items)
+                self.model_tree.expandAll()  # Expand by default
+            finally:
+                self.model_tree.blockSignals(False)
+                self.model_tree.setUpdatesEnabled(True)
+        else:
+            empty_item = QTreeWidgetItem(self.model_tree)
+            empty_item.setText(0, "No models found")
+            self.model_tree.addTopLevelItem(empty_item)
     
+    @pyqtSlot(str)
+    def show_fetch_error(self, error_message):
+        """Show a model fetch error in the tree"""
+        self.model_tree.clear()
+        error_item = QTreeWidgetItem(self.model_tree)
+        error_item.setText(0, error_message)
+        self.model_tree.addTopLevelItem(error_item)
+    
+    @pyqtSlot()
     def apply_settings(self):
         """Apply the selected settings and close dialog"""
         self.api_url = self.api_url_input.text().strip()
@@ -474,12 +902,12 @@ class ModelSelectionDialog(QDialog):
         selected_items = self.model_tree.selectedItems()
         if selected_items and hasattr(selected_items[0], 'model_data'):
             model_data = selected_items[0].model_data
-            self.selected_model = model_data['original_name']
+            self.selected_model = model_data.original_name
             
             # Create display name - base model name with optional size
-            display_name = model_data['formatted_name']
-            if model_data['size_info']:
-                self.display_name = f"{display_name} ({model_data['size_info']})"
+            display_name = model_data.formatted_name
+            if model_data.size_info:
+                self.display_name = f"{display_name} ({model_data.size_info})"
             else:
                 self.display_name = display_name
                 
@@ -489,12 +917,47 @@ class ModelSelectionDialog(QDialog):
             pass
 
 
+@lru_cache(maxsize=None)
+def get_markdown_converter():
+    """Create the markdown converter shared by all bot bubbles (GUI thread only)
+    
+    Built on first use so startup does not pay for loading the extensions
+    (codehilite pulls in Pygments) before the first bot message is shown.
+    """
+    return markdown.Markdown(extensions=['tables', 'fenced_code', 'codehilite'])
+
+
+@lru_cache(maxsize=512)
+def render_markdown(message):
+    """Convert a markdown message to HTML, caching results for repeated content"""
+    # Preserve newlines before markdown conversion
+    processed_message = message.replace('\n', '  \n')
+    
+    # Convert markdown to HTML with the shared converter
+    return get_markdown_converter().reset().convert(processed_message)
+
+
 class ChatBubble(QFrame):
     """Chat message bubble - redesigned with user messages on right, bot on left, more minimalist"""
-    def __init__(self, message, is_user=False, parent=None):
+    # Document heights shared by all bubbles, least recently used first
+    height_cache = OrderedDict()
+    
+    def __init__(self, message, is_user=False, parent=None, streaming=False):
         super().__init__(parent)
         self.is_user = is_user
         
+        # Message text as completed blocks plus the unfinished tail; the tail is
+        # the only string grown per streamed chunk, so appends stay cheap
+        self.stable_parts = []
+        self.tail = ""
+        self.message = message
+        
+        # Rendered HTML for the completed blocks of a streaming message
+        self.stable_html = ""
+        
+        # Set when the width changed and the bot message height must be re-fitted
+        self.layout_stale = False
+        
         # Configure frame - no background
         self.setFrameShape(QFrame.NoFrame)
         self.setAutoFillBackground(False)
@@ -521,16 +984,8 @@ class ChatBubble(QFrame):
             message_label.setTextFormat(Qt.PlainText)
             message_label.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
             
-            # Apply styling - right alignment
-            message_label.setStyleSheet(f"""
-                QLabel {{
-                    background-color: transparent;
-                    color: {CHATGPT_TEXT_COLOR};
-                    font-family: {FONT_FAMILY};
-                    font-size: 16px;
-                    border: none;
-                }}
-            """)
+            # Styled by the application stylesheet - right alignment
+            message_label.setObjectName("user_message")
             
             # Set alignment
             message_label.setAlignment(Qt.AlignRight | Qt.AlignTop)
@@ -539,6 +994,7 @@ class ChatBubble(QFrame):
             message_label.setMaximumWidth(int(parent.width() * 0.8) if parent else 800)
             
             user_layout.addWidget(message_label)
+            self.message_widget = message_label
             main_layout.addWidget(message_container)
             
         else:
@@ -552,113 +1008,25 @@ class ChatBubble(QFrame):
             # Use QTextEdit for bot messages (supports markdown, no scrollbars)
             message_view = QTextEdit()
             message_view.setReadOnly(True)
+            # Display-only: no undo history and selection-only interaction, like a label
+            message_view.setUndoRedoEnabled(False)
+            message_view.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
             message_view.setFrameStyle(QFrame.NoFrame)
             message_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
             message_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
             
-            # Apply styling - left alignment
-            message_view.setStyleSheet(f"""
-                QTextEdit {{
-                    background-color: transparent;
-                    color: {CHATGPT_TEXT_COLOR};
-                    font-family: {FONT_FAMILY};
-                    font-size: 16px;
-                    border: none;
-                    selection-color: white;
-                    selection-background-color: #3390FF;
-                }}
-            """)
+            # Styled by the application stylesheet - left alignment
+            message_view.setObjectName("bot_message")
             
             # Set maximum width to 80% of parent width (will adjust dynamically)
             message_view.setMaximumWidth(int(parent.width() * 0.8) if parent else 800)
             
-            # Convert markdown to HTML
-            try:
-                # Define custom CSS for markdown
-                markdown_css = """
-                <style>
-                    body {
-                        font-family: 'Segoe UI', sans-serif;
-                        font-size: 16px;
-                        line-height: 1.6;
-                        color: #FFFFFF;
-                    }
-                    pre {
-                        background-color: #2D2D2D;
-                        border-radius: 5px;
-                        padding: 10px;
-                        overflow-x: auto;
-                    }
-                    code {
-                        font-family: 'Consolas', monospace;
-                        background-color: #2D2D2D;
-                        padding: 2px 4px;
-                        border-radius: 3px;
-                    }
-                    table {
-                        border-collapse: collapse;
-                        width: 100%;
-                        margin: 10px 0;
-                    }
-                    th, td {
-                        border: 1px solid #444;
-                        padding: 8px;
-                        text-align: left;
-                    }
-                    th {
-                        background-color: #333;
-                    }
-                    a {
-                        color: #3390FF;
-                        text-decoration: none;
-                    }
-                    a:hover {
-                        text-decoration: underline;
-                    }
-                    blockquote {
-                        border-left: 4px solid #444;
-                        margin-left: 0;
-                        padding-left: 15px;
-                        color: #BBB;
-                    }
-                    img {
-                        max-width: 100%;
-                        height: auto;
-                    }
-                    h1, h2, h3, h4, h5, h6 {
-                        margin-top: 20px;
-                        margin-bottom: 10px;
-                        font-weight: 600;
-                    }
-                    ol, ul {
-                        padding-left: 20px;
-                    }
-                </style>
-                """
-                
-                # Preserve newlines before markdown conversion
-                processed_message = message.replace('\n', '  \n')
-                
-                # Convert markdown to HTML
-                html_content = markdown.markdown(
-                    processed_message,
-                    extensions=['tables', 'fenced_code', 'codehilite']
-                )
-                
-                # Set the HTML content with our custom CSS
-                message_view.setHtml(markdown_css + html_content)
-            except Exception as e:
-                # Fallback to plain text if markdown conversion fails
-                message_view.setPlainText(message)
-                print(f"Markdown conversion error: {str(e)}")
-            
-            # Auto-adjust height based on content
-            message_view.document().adjustSize()
-            # Convert float to int for setFixedHeight
-            doc_height = int(message_view.document().size().height() + 10)
-            message_view.setFixedHeight(doc_height)
+            # Apply the markdown CSS once to the document instead of inlining it in the HTML
+            message_view.document().setDefaultStyleSheet(MARKDOWN_CSS)
             
             bot_layout.addWidget(message_view)
+            self.message_widget = message_view
+            self.set_text(message, streaming)
             
             # Add buttons row (copy, thumbs up/down) for assistant messages only
             buttons_layout = QHBoxLayout()
@@ -669,32 +1037,20 @@ class ChatBubble(QFrame):
             # Add copy button
             copy_btn = QToolButton()
             copy_btn.setToolTip("Copy to clipboard")
-            copy_btn.setStyleSheet(f"""
-                QToolButton {{
-                    background-color: transparent;
-                    border: none;
-                    color: {CHATGPT_SECONDARY_TEXT};
-                    padding: 0px;
-                    font-size: 14px;
-                }}
-                QToolButton:hover {{
-                    background-color: rgba(255, 255, 255, 0.1);
-                    border-radius: 4px;
-                }}
-            """)
+            copy_btn.setObjectName("bubble_button")
             copy_btn.setText("📋")
-            copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(message))
+            copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(self.message))
             
             # Add Thumbs up and down buttons
             thumbs_up = QToolButton()
             thumbs_up.setToolTip("Thumbs up")
             thumbs_up.setText("👍")
-            thumbs_up.setStyleSheet(copy_btn.styleSheet())
+            thumbs_up.setObjectName("bubble_button")
             
             thumbs_down = QToolButton()
             thumbs_down.setToolTip("Thumbs down")
             thumbs_down.setText("👎")
-            thumbs_down.setStyleSheet(copy_btn.styleSheet())
+            thumbs_down.setObjectName("bubble_button")
             
             buttons_layout.addWidget(copy_btn)
             buttons_layout.addWidget(thumbs_up)
@@ -706,15 +1062,132 @@ class ChatBubble(QFrame):
             main_layout.addWidget(message_container)
             main_layout.addStretch(1)  # Push content to the left
     
+    @property
+    def message(self):
+        """The full message text"""
+        return ''.join(self.stable_parts) + self.tail
+    
+    @message.setter
+    def message(self, message):
+        self.stable_parts = [message]
+        self.tail = ""
+    
+    def set_text(self, message, streaming=False):
+        """Replace the bubble content, re-rendering markdown for bot messages"""
+        if self.is_user:
+            self.message = message
+            self.message_widget.setText(message)
+            return
+        
+        message_view = self.message_widget
+        self.stable_html = ""
+        
+        # A streamed message starts empty and is built up by append_text
+        if streaming:
+            self.message = ""
+            message_view.clear()
+            self.append_text(message)
+            return
+        
+        self.message = message
+        
+        # Convert markdown to HTML
+        try:
+            # Set the HTML content - styled by the document's default stylesheet
+            message_view.setHtml(render_markdown(message))
+        except Exception as e:
+            # Fallback to plain text if markdown conversion fails
+            message_view.setPlainText(message)
+            logger.warning("Markdown conversion error: %s", e)
+        
+        self.fit_document_height()
+    
+    def append_text(self, chunk):
+        """Append a streamed chunk, re-rendering markdown only when a block completes
+        
+        Blocks before the last blank line are rendered once they are complete; the
+        unfinished block is shown as plain text and extended in place with a cursor.
+        The completed response is rendered in full by set_text once streaming ends.
+        """
+        tail = self.tail + chunk
+        message_view = self.message_widget
+        cursor = QTextCursor(message_view.document())
+        cursor.movePosition(QTextCursor.End)
+        
+        split_index = tail.rfind('\n\n')
+        # Never split inside a fenced code block
+        if split_index > 0 and tail.count('```', 0, split_index) % 2 == 0:
+            # Invalidate the view once for the whole re-render rather than per edit
+            message_view.setUpdatesEnabled(False)
+            try:
+                completed = tail[:split_index]
+                self.stable_html += render_markdown(completed)
+                self.stable_parts.append(completed)
+                tail = tail[split_index:]
+                
+                # Re-render the completed blocks, then start the new block as plain text
+                message_view.setHtml(self.stable_html)
+                cursor.movePosition(QTextCursor.End)
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+                cursor.insertText(tail.lstrip('\n'))
+            except Exception as e:
+                # Fallback to plain text if markdown conversion fails
+                message_view.setPlainText(''.join(self.stable_parts) + tail)
+                logger.warning("Markdown conversion error: %s", e)
+            finally:
+                message_view.setUpdatesEnabled(True)
+        else:
+            # Only the unfinished block grew, so append the new text in place
+            cursor.insertText(chunk)
+        
+        self.tail = tail
+        self.fit_document_height()
+    
+    def fit_document_height(self):
+        """Auto-adjust the message view height to its content"""
+        message_view = self.message_widget
+        message_view.document().adjustSize()
+        # Convert float to int for setFixedHeight
+        doc_height = int(message_view.document().size().height() + 10)
+        message_view.setFixedHeight(doc_height)
+    
     def resizeEvent(self, event):
         """Handle resize events to adjust text width"""
         super().resizeEvent(event)
         
-        # Find child widgets to adjust
-        for child in self.findChildren(QWidget):
-            if isinstance(child, QLabel) or isinstance(child, QTextEdit):
-                # Adjust width to 80% of the parent width
-                child.setMaximumWidth(int(self.width() * 0.8))
+        # Adjust message width to 80% of the parent width
+        self.message_widget.setMaximumWidth(int(self.width() * 0.8))
+        
+        # Re-fit bot messages when they are next painted, so off-screen bubbles skip the relayout
+        if not self.is_user and event.size().width() != event.oldSize().width():
+            self.layout_stale = True
+    
+    def paintEvent(self, event):
+        """Re-fit a stale message height once the bubble is actually visible"""
+        super().paintEvent(event)
+        
+        if self.layout_stale:
+            self.layout_stale = False
+            QTimer.singleShot(0, self.update_height)
+    
+    def update_height(self):
+        """Fit the message view height to its document at the current width"""
+        message_view = self.message_widget
+        width = message_view.viewport().width()
+        key = (hash(self.message), width)
+        
+        height = self.height_cache.get(key)
+        if height is None:
+            document = message_view.document()
+            document.setTextWidth(width)
+            height = int(document.size().height() + 10)
+            self.height_cache[key] = height
+            if len(self.height_cache) > HEIGHT_CACHE_SIZE:
+                self.height_cache.popitem(last=False)
+        else:
+            self.height_cache.move_to_end(key)
+        
+        message_view.setFixedHeight(height)
 
 
 class SystemPromptDialog(QDialog):
@@ -727,56 +1200,8 @@ class SystemPromptDialog(QDialog):
         self.setWindowTitle("Configure System Prompt")
         self.setMinimumSize(600, 450)
         
-        # Apply stylesheets
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {CHATGPT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: {BORDER_RADIUS};
-                font-family: {FONT_FAMILY};
-            }}
-            QLabel {{
-                color: {CHATGPT_TEXT_COLOR};
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            QTextEdit {{
-                background-color: {CHATGPT_INPUT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                border-radius: 12px;
-                border: 1px solid #424242;
-                padding: 8px 12px;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton {{
-                background-color: {CHATGPT_ACCENT};
-                color: black;
-                border: none;
-                border-radius: 12px;
-                padding: 10px 16px;
-                font-weight: 600;
-                font-size: 14px;
-                font-family: {FONT_FAMILY};
-            }}
-            QPushButton:hover {{
-                background-color: #E0E0E0;
-            }}
-            QCheckBox {{
-                color: {CHATGPT_TEXT_COLOR};
-                font-size: 14px;
-            }}
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-                border: 2px solid {CHATGPT_SECONDARY_TEXT};
-                border-radius: 3px;
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {CHATGPT_ACCENT};
-                border: 2px solid {CHATGPT_ACCENT};
-            }}
-        """)
+        # Styled by the application stylesheet
+        self.setObjectName("system_prompt_dialog")
         
         layout = QVBoxLayout(self)
         layout.setSpacing(16)
@@ -824,7 +1249,7 @@ class SystemPromptDialog(QDialog):
         examples_layout = QVBoxLayout()
         for example in examples:
             example_btn = QPushButton(example)
-            example_btn.clicked.connect(lambda checked, text=example: self.set_example(text))
+            example_btn.clicked.connect(self.example_clicked)
             examples_layout.addWidget(example_btn)
         
         layout.addLayout(examples_layout)
@@ -847,26 +1272,38 @@ class SystemPromptDialog(QDialog):
         """Set an example prompt"""
         self.prompt_input.setText(text)
     
+    @pyqtSlot()
+    def example_clicked(self):
+        """Set the example prompt shown on the clicked button"""
+        self.set_example(self.sender().text())
+    
+    @pyqtSlot()
     def clear_prompt(self):
         """Clear the prompt input"""
         self.prompt_input.clear()
     
+    @pyqtSlot()
     def save_prompt(self):
         """Save the prompt and close dialog"""
+        previous_config = (self.system_prompt, self.use_streaming)
         self.system_prompt = self.prompt_input.toPlainText().strip()
         self.use_streaming = self.streaming_checkbox.isChecked()
         
-        # Save configuration to file
-        try:
-            config = {
-                'system_prompt': self.system_prompt,
-                'use_streaming': self.use_streaming
-            }
-            
-            with open('ollama_config.json', 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error saving configuration: {str(e)}")
+        # Save configuration to file, skipping the write when nothing changed
+        if (self.system_prompt, self.use_streaming) != previous_config:
+            try:
+                config = {
+                    'system_prompt': self.system_prompt,
+                    'use_streaming': self.use_streaming
+                }
+                
+                # Write to a temporary file and swap it in so the config is never half-written
+                temp_path = CONFIG_FILE + '.tmp'
+                with open(temp_path, 'w') as f:
+                    json.dump(config, f)
+                os.replace(temp_path, CONFIG_FILE)
+            except Exception as e:
+                logger.error("Error saving configuration: %s", e)
         
         self.accept()
 
@@ -882,58 +1319,52 @@ class CommandPredictionPopup(QFrame):
         # Configure frame
         self.setFrameShape(QFrame.StyledPanel)
         self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint)
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {CHATGPT_INPUT_BG};
-                border: 1px solid #424242;
-                border-radius: 8px;
-            }}
-            QLabel {{
-                color: {CHATGPT_TEXT_COLOR};
-                font-size: 14px;
-                padding: 4px 8px;
-            }}
-            QLabel:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-                border-radius: 4px;
-            }}
-        """)
+        self.setObjectName("command_popup")
         
         # Layout
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(8, 8, 8, 8)
         self.layout.setSpacing(2)
         
-        self.prediction_widgets = []
+        # Labels are created on demand and reused, hiding the rows not needed
+        self.rows = []
+        self.row_commands = []
+    
+    def add_row(self):
+        """Create a reusable prediction label that selects its row's command"""
+        index = len(self.rows)
+        row = QLabel()
+        row.setCursor(Qt.PointingHandCursor)
+        row.setTextFormat(Qt.PlainText)  # Use plain text instead of rich text
+        row.mousePressEvent = lambda e: self.select_command(self.row_commands[index])
+        
+        self.layout.addWidget(row)
+        self.rows.append(row)
+        self.row_commands.append("")
+        return row
     
     def update_predictions(self, predictions):
         """Update the prediction list"""
-        # Clear existing predictions
-        for widget in self.prediction_widgets:
-            self.layout.removeWidget(widget)
-            widget.deleteLater()
-        self.prediction_widgets = []
-        
         if not predictions:
             self.hide()
             return
         
-        # Add new predictions
-        for pred in predictions:
-            # Create a label without HTML and use stylesheet for bold text
-            cmd_widget = QLabel(f"{pred['command']} - {pred['description']}")
-            cmd_widget.setStyleSheet("font-weight: bold;")
-            cmd_widget.setCursor(Qt.PointingHandCursor)
-            cmd_widget.setTextFormat(Qt.PlainText)  # Use plain text instead of rich text
-            cmd_widget.mousePressEvent = lambda e, cmd=pred['command']: self.select_command(cmd)
-            
-            self.layout.addWidget(cmd_widget)
-            self.prediction_widgets.append(cmd_widget)
+        # Fill a row per prediction, adding labels only when there are more than ever before
+        for index, pred in enumerate(predictions):
+            row = self.rows[index] if index < len(self.rows) else self.add_row()
+            row.setText(f"{pred['command']} - {pred['description']}")
+            row.show()
+            self.row_commands[index] = pred['command']
+        
+        # Hide the rows left over from longer lists
+        for row in self.rows[len(predictions):]:
+            row.hide()
         
         # Show the popup
         self.adjustSize()
         self.show()
     
+    @pyqtSlot(str)
     def select_command(self, command):
         """Emit signal when a command is selected"""
         self.command_selected.emit(command)
@@ -945,47 +1376,46 @@ class SlashCommandHandler:
     
     def __init__(self, chat_gui):
         self.chat_gui = chat_gui
-        self.commands = {
-            "/clear": {
-                "description": "Clear the chat history",
-                "action": self.clear_chat
-            },
-            "/models": {
-                "description": "Open model selection panel",
-                "action": self.open_models
-            },
-            "/system": {
-                "description": "Configure system prompt",
-                "action": self.open_system_prompt
-            },
-            "/bye": {
-                "description": "Exit the application",
-                "action": self.exit_app
-            }
-        }
+        # (command, description, action) rows, kept sorted by command for prefix lookups
+        self.commands = tuple(sorted((
+            ("/clear", "Clear the chat history", self.clear_chat),
+            ("/models", "Open model selection panel", self.open_models),
+            ("/system", "Configure system prompt", self.open_system_prompt),
+            ("/bye", "Exit the application", self.exit_app),
+        ), key=lambda row: row[0]))
+        
+        # Command names, actions and prebuilt prediction records derived from the table
+        self.sorted_commands = tuple(cmd for cmd, _, _ in self.commands)
+        self.actions = {cmd: action for cmd, _, action in self.commands}
+        self.all_predictions = [
+            {"command": cmd, "description": description}
+            for cmd, description, _ in self.commands
+        ]
     
     def get_predictions(self, current_text):
         """Get command predictions based on current text"""
         if not current_text.startswith('/'):
             return []
         
-        predictions = []
-        for cmd in self.commands.keys():
-            if cmd.startswith(current_text):
-                predictions.append({
-                    "command": cmd,
-                    "description": self.commands[cmd]["description"]
-                })
+        if current_text == '/':
+            return list(self.all_predictions)
         
-        return predictions
+        # Matching commands form a contiguous run in the sorted command names
+        start = bisect.bisect_left(self.sorted_commands, current_text)
+        end = start
+        while end < len(self.sorted_commands) and self.sorted_commands[end].startswith(current_text):
+            end += 1
+        
+        return self.all_predictions[start:end]
     
     def process_command(self, command_text):
         """Process a slash command"""
         command = command_text.split()[0]  # Get the first word as the command
         
-        if command in self.commands:
+        action = self.actions.get(command)
+        if action:
             # Execute the command action
-            self.commands[command]["action"]()
+            action()
             return True
         
         return False
@@ -993,7 +1423,8 @@ class SlashCommandHandler:
     # Command actions
     def clear_chat(self):
         """Clear the chat history"""
-        self.chat_gui.conversation_history = []
+        self.chat_gui.cancel_request()
+        self.chat_gui.conversation_history.clear()
         self.chat_gui.setup_welcome_view()
         # If we have an input layout, center it for the welcome screen
         if hasattr(self.chat_gui, 'input_layout'):
@@ -1012,18 +1443,67 @@ class SlashCommandHandler:
         self.chat_gui.close()
 
 
+def render_glyph_icon(glyph, size=16, color="#000000"):
+    """Draw a text glyph into an icon once, so swapping icons skips font fallback on paint"""
+    ratio = QApplication.instance().devicePixelRatio()
+    pixmap = QPixmap(int(size * ratio), int(size * ratio))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.transparent)
+    
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    painter.setPen(QColor(color))
+    font = QFont(QApplication.font())
+    font.setPixelSize(int(size * 0.8))
+    font.setBold(True)
+    painter.setFont(font)
+    painter.drawText(QRect(0, 0, size, size), Qt.AlignCenter, glyph)
+    painter.end()
+    
+    return QIcon(pixmap)
+
+
 class OllamaChatGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Ollama Chat")
         self.setGeometry(100, 100, 1200, 800)
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=CONVERSATION_HISTORY_SIZE)
+        # True while the welcome view is shown instead of chat bubbles
+        self.is_empty_conversation = True
+        self.welcome_widget = None
         self.api_url = "http://localhost:11434"
         self.current_model = ""
         self.system_prompt = ""
         self.use_streaming = False
         self.current_streaming_bubble = None
         
+        # Created by setup_ui; None until then so set_busy is safe to call early
+        self.send_btn = None
+        
+        # Hidden chat bubbles kept after /clear for reuse, by is_user
+        self.bubble_pools = {True: deque(), False: deque()}
+        
+        # Coalesces scroll-to-bottom requests while a response is streaming
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(30)
+        self.scroll_timer.timeout.connect(self.snap_to_bottom)
+        
+        # Batches streamed text from the request thread into ~30 UI updates per second
+        self.thread = None
+        self.worker = None
+        self.chunk_flush_timer = QTimer(self)
+        self.chunk_flush_timer.setSingleShot(True)
+        self.chunk_flush_timer.setInterval(33)
+        self.chunk_flush_timer.timeout.connect(self.flush_streaming_chunks)
+        
+        # Debounces command prediction updates while typing
+        self.prediction_timer = QTimer(self)
+        self.prediction_timer.setSingleShot(True)
+        self.prediction_timer.setInterval(50)
+        self.prediction_timer.timeout.connect(self.update_command_predictions)
+        
         # Load configuration
         self.load_config()
         
@@ -1042,19 +1522,20 @@ class OllamaChatGUI(QMainWindow):
     def load_config(self):
         """Load configuration from file"""
         try:
-            if os.path.exists('ollama_config.json'):
-                with open('ollama_config.json', 'r') as f:
-                    config = json.load(f)
-                    
-                    if 'system_prompt' in config:
-                        self.system_prompt = config['system_prompt']
+            with open(CONFIG_FILE, 'r') as f:
+                config = json.load(f)
+                
+                if 'system_prompt' in config:
+                    self.system_prompt = config['system_prompt']
+                
+                if 'use_streaming' in config:
+                    self.use_streaming = config['use_streaming']
                     
-                    if 'use_streaming' in config:
-                        self.use_streaming = config['use_streaming']
-                        
-                print(f"Loaded configuration. System prompt: {len(self.system_prompt)} chars, Streaming: {self.use_streaming}")
+            logger.debug("Loaded configuration. System prompt: %d chars, Streaming: %s", len(self.system_prompt), self.use_streaming)
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            print(f"Error loading configuration: {str(e)}")
+            logger.error("Error loading configuration: %s", e)
         
     def setup_fonts(self):
         """Set up high-quality fonts for the application with improved rendering"""
@@ -1063,45 +1544,11 @@ class OllamaChatGUI(QMainWindow):
         font.setStyleHint(QFont.SansSerif)
         font.setHintingPreference(QFont.PreferFullHinting)
         font.setWeight(QFont.Medium)
-        # Enable subpixel antialiasing for better text rendering
-        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
         QApplication.setFont(font)
         
     def setup_ui(self):
         # Apply global stylesheet
-        self.setStyleSheet(f"""
-            QMainWindow, QWidget {{
-                background-color: {CHATGPT_BG};
-                color: {CHATGPT_TEXT_COLOR};
-                font-family: {FONT_FAMILY};
-            }}
-            
-            QScrollArea {{
-                border: none;
-                background-color: {CHATGPT_BG};
-            }}
-            
-            QScrollBar:vertical {{
-                background-color: {CHATGPT_BG};
-                width: 8px;
-                margin: 0px;
-            }}
-            
-            QScrollBar::handle:vertical {{
-                background-color: #555555;
-                min-height: 30px;
-                border-radius: 4px;
-            }}
-            
-            QScrollBar::handle:vertical:hover {{
-                background-color: #777777;
-            }}
-            
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-        """)
+        QApplication.instance().setStyleSheet(APP_STYLESHEET)
         
         # Main layout with central widget
         central_widget = QWidget()
@@ -1112,20 +1559,14 @@ class OllamaChatGUI(QMainWindow):
         # Header
         header_widget = QWidget()
         header_widget.setFixedHeight(48)
-        header_widget.setStyleSheet(f"background-color: {CHATGPT_BG};")
+        header_widget.setObjectName("header")
         
         header_layout = QHBoxLayout(header_widget)
         header_layout.setContentsMargins(15, 0, 15, 0)
         
         # High-quality logo/chat name rendering - clickable to select model
         self.header_title = QLabel("Ollama Chat")
-        self.header_title.setStyleSheet(f"""
-            font-weight: 600; 
-            font-size: 18px;
-            color: {CHATGPT_TEXT_COLOR};
-            font-family: {FONT_FAMILY};
-            padding: 8px 14px;
-        """)
+        self.header_title.setObjectName("header_title")
         self.header_title.setCursor(Qt.PointingHandCursor)  # Change cursor to indicate clickable
         self.header_title.mousePressEvent = self.title_clicked  # Set click handler
         
@@ -1136,18 +1577,7 @@ class OllamaChatGUI(QMainWindow):
         self.system_prompt_btn = QToolButton()
         self.system_prompt_btn.setText("⚙️")
         self.system_prompt_btn.setToolTip("Configure System Prompt")
-        self.system_prompt_btn.setStyleSheet(f"""
-            QToolButton {{
-                background-color: transparent;
-                border-radius: 8px;
-                padding: 6px;
-                color: {CHATGPT_SECONDARY_TEXT};
-                font-size: 16px;
-            }}
-            QToolButton:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-            }}
-        """)
+        self.system_prompt_btn.setObjectName("system_prompt_button")
         self.system_prompt_btn.clicked.connect(self.show_system_prompt_dialog)
         header_layout.addWidget(self.system_prompt_btn)
         
@@ -1174,50 +1604,31 @@ class OllamaChatGUI(QMainWindow):
         
         # Input area at the bottom (ChatGPT style)
         self.input_container = QWidget()
-        self.input_container.setStyleSheet(f"background-color: {CHATGPT_BG};")
+        self.input_container.setObjectName("input_container")
         self.input_layout = QVBoxLayout(self.input_container)
         
         # Store original margins to restore them when chat has messages
         self.original_input_margins = (16, 10, 16, 24)
         
         # If chat is empty, use larger margins and center the input
-        if len(self.conversation_history) == 0:
+        if self.is_empty_conversation:
             self.input_layout.setContentsMargins(120, 10, 120, 24)
         else:
             self.input_layout.setContentsMargins(*self.original_input_margins)
         
         # Input box with buttons
         self.input_frame = QFrame()
-        self.input_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {CHATGPT_INPUT_BG};
-                border-radius: {BORDER_RADIUS};
-                border: 1px solid #424242;
-            }}
-        """)
+        self.input_frame.setObjectName("input_frame")
         
         input_box_layout = QVBoxLayout(self.input_frame)
         input_box_layout.setContentsMargins(16, 12, 16, 12)
         input_box_layout.setSpacing(8)
         
         # Message input
-        self.message_input = QTextEdit()
+        self.message_input = QPlainTextEdit()
         self.message_input.setPlaceholderText("Ask anything or type / for commands")
-        self.message_input.setAcceptRichText(False)
         self.message_input.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.message_input.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: transparent;
-                border: none;
-                color: {CHATGPT_TEXT_COLOR};
-                font-size: 16px;
-                padding: 0px;
-                font-family: {FONT_FAMILY};
-            }}
-            QTextEdit:focus {{
-                outline: none;
-            }}
-        """)
+        self.message_input.setObjectName("message_input")
         self.message_input.setFixedHeight(60)
         
         # Command prediction popup
@@ -1227,31 +1638,17 @@ class OllamaChatGUI(QMainWindow):
         
         # Button row below the input
         button_row = QWidget()
-        button_row.setStyleSheet("background-color: transparent;")
+        button_row.setObjectName("button_row")
         button_row_layout = QHBoxLayout(button_row)
         button_row_layout.setContentsMargins(0, 0, 0, 0)
         button_row_layout.setSpacing(10)
         
         # Action buttons like in ChatGPT
-        button_style = f"""
-            QToolButton {{
-                background-color: transparent;
-                border-radius: 8px;
-                padding: 6px;
-                color: {CHATGPT_SECONDARY_TEXT};
-                font-size: 14px;
-            }}
-            QToolButton:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-            }}
-        """
-        
         # "+" button 
         plus_btn = QToolButton()
         plus_btn.setText("+")
         plus_btn.setObjectName("plus_button")
         plus_btn.setToolTip("New chat")
-        plus_btn.setStyleSheet(button_style)
         plus_btn.clicked.connect(lambda: self.command_handler.clear_chat())
         
         # Search button
@@ -1259,26 +1656,16 @@ class OllamaChatGUI(QMainWindow):
         search_btn.setText("🔍")
         search_btn.setObjectName("search_button")
         search_btn.setToolTip("Search models")
-        search_btn.setStyleSheet(button_style)
         search_btn.clicked.connect(self.show_model_dialog)
         
-        # Send button (right side) - now white with black text
+        # Send button (right side) - now white with a black icon, rendered once for both states
+        self.send_icon = render_glyph_icon("▶")
+        self.busy_icon = render_glyph_icon("⏳")
         self.send_btn = QToolButton()
-        self.send_btn.setText("▶")
+        self.send_btn.setIcon(self.send_icon)
+        self.send_btn.setIconSize(QSize(16, 16))
         self.send_btn.setObjectName("send_button")  
         self.send_btn.setToolTip("Send message")
-        self.send_btn.setStyleSheet(f"""
-            QToolButton {{
-                background-color: {CHATGPT_ACCENT};
-                border-radius: 12px;
-                padding: 8px;
-                color: #000000;
-                font-weight: bold;
-            }}
-            QToolButton:hover {{
-                background-color: #E0E0E0;
-            }}
-        """)
         self.send_btn.clicked.connect(self.send_message)
         
         button_row_layout.addWidget(plus_btn)
@@ -1293,7 +1680,7 @@ class OllamaChatGUI(QMainWindow):
         
         # Add disclaimer at bottom (like ChatGPT's "ChatGPT can make mistakes" text)
         disclaimer = QLabel("Ollama can make mistakes. Check important info.")
-        disclaimer.setStyleSheet(f"color: {CHATGPT_PLACEHOLDER}; font-size: 12px; text-align: center; font-family: {FONT_FAMILY};")
+        disclaimer.setObjectName("disclaimer")
         disclaimer.setAlignment(Qt.AlignCenter)
         self.input_layout.addWidget(disclaimer)
         
@@ -1305,18 +1692,41 @@ class OllamaChatGUI(QMainWindow):
         self.message_input.installEventFilter(self)
         self.message_input.textChanged.connect(self.on_text_changed)
     
+    @pyqtSlot(str)
     def insert_command(self, command):
         """Insert selected command into input field"""
-        self.message_input.setText(command + " ")
+        self.message_input.setPlainText(command + " ")
         self.message_input.setFocus()
         # Move cursor to end
         cursor = self.message_input.textCursor()
         cursor.movePosition(QTextCursor.End)
         self.message_input.setTextCursor(cursor)
     
+    @pyqtSlot()
     def on_text_changed(self):
         """Handle text changes in the input field for command prediction"""
-        current_text = self.message_input.toPlainText()
+        # Only text starting with '/' can show predictions - check just the first
+        # character instead of copying the whole input on every keystroke
+        if self.message_input.document().characterAt(0) != '/':
+            self.prediction_timer.stop()
+            if self.prediction_popup.isVisible():
+                self.prediction_popup.hide()
+            return
+        
+        # Debounce prediction updates while the user is typing
+        self.prediction_timer.start()
+    
+    @pyqtSlot()
+    def update_command_predictions(self):
+        """Show command predictions for the current input text"""
+        document = self.message_input.document()
+        
+        # Commands are a single line, so multi-line input never matches one
+        if document.blockCount() > 1:
+            self.prediction_popup.hide()
+            return
+        
+        current_text = document.firstBlock().text()
         
         # Check if we need to show command predictions
         if current_text.startswith('/'):
@@ -1337,37 +1747,59 @@ class OllamaChatGUI(QMainWindow):
     
     def setup_welcome_view(self):
         """Setup the welcome view shown when no messages are present"""
-        # Clear existing widgets from chat layout
+        # Clear existing widgets from chat layout, keeping chat bubbles for reuse
         while self.chat_layout.count():
             item = self.chat_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Create welcome widget
-        welcome_widget = QWidget()
-        welcome_layout = QVBoxLayout(welcome_widget)
-        welcome_layout.setContentsMargins(0, 0, 0, 0)
-        welcome_layout.setAlignment(Qt.AlignHCenter | Qt.AlignCenter)
-        welcome_layout.setSpacing(0)
-        
-        # Main title with high-quality rendering
-        title = QLabel("What can I help with?")
-        title.setStyleSheet(f"""
-            color: {CHATGPT_TEXT_COLOR};
-            font-size: 32px;
-            font-weight: 600;
-            font-family: {FONT_FAMILY};
-        """)
-        title.setAlignment(Qt.AlignCenter)
-        welcome_layout.addWidget(title)
-        
-        self.chat_layout.addWidget(welcome_widget)
+            widget = item.widget()
+            if isinstance(widget, ChatBubble):
+                self.release_bubble(widget)
+            elif widget and widget is not self.welcome_widget:
+                widget.deleteLater()
+        self.is_empty_conversation = True
+        
+        # Create the welcome widget once and reuse it on every later /clear
+        if self.welcome_widget is None:
+            self.welcome_widget = QWidget()
+            welcome_layout = QVBoxLayout(self.welcome_widget)
+            welcome_layout.setContentsMargins(0, 0, 0, 0)
+            welcome_layout.setAlignment(Qt.AlignHCenter | Qt.AlignCenter)
+            welcome_layout.setSpacing(0)
+            
+            # Main title with high-quality rendering
+            title = QLabel("What can I help with?")
+            title.setObjectName("welcome_title")
+            title.setAlignment(Qt.AlignCenter)
+            welcome_layout.addWidget(title)
+        
+        self.chat_layout.addWidget(self.welcome_widget)
+        self.welcome_widget.show()
         
         # When in welcome view, center the input bar with larger margins
         # Only update if the attribute exists (to avoid startup errors)
         if hasattr(self, 'input_layout'):
             self.input_layout.setContentsMargins(120, 10, 120, 24)
     
+    def acquire_bubble(self, message, is_user=False, streaming=False):
+        """Get a chat bubble for a message, reusing a pooled one when available"""
+        pool = self.bubble_pools[is_user]
+        if pool:
+            bubble = pool.pop()
+            bubble.set_text(message, streaming)
+            bubble.show()
+            return bubble
+        
+        return ChatBubble(message, is_user, streaming=streaming)
+    
+    def release_bubble(self, bubble):
+        """Hide a removed chat bubble and keep it for reuse, up to the pool size"""
+        pool = self.bubble_pools[bubble.is_user]
+        if bubble is self.current_streaming_bubble or len(pool) >= BUBBLE_POOL_SIZE:
+            bubble.deleteLater()
+            return
+        
+        bubble.hide()
+        pool.append(bubble)
+    
     def eventFilter(self, obj, event):
         """Event filter for handling key presses in message input"""
         if obj is self.message_input and event.type() == event.KeyPress:
@@ -1380,6 +1812,7 @@ class OllamaChatGUI(QMainWindow):
         """Handle clicks on the header title by showing model dialog"""
         self.show_model_dialog()
     
+    @pyqtSlot()
     def show_system_prompt_dialog(self):
         """Show dialog for configuring system prompt"""
         dialog = SystemPromptDialog(self, self.system_prompt, self.use_streaming)
@@ -1398,7 +1831,7 @@ class OllamaChatGUI(QMainWindow):
     def add_streaming_bubble(self, message, is_user=False):
         """Add a chat bubble for streaming responses"""
         # Create a chat bubble for the first chunk
-        bubble = ChatBubble(message, is_user)
+        bubble = self.acquire_bubble(message, is_user, streaming=True)
         
         # Store the bubble for further updates
         self.current_streaming_bubble = bubble
@@ -1411,51 +1844,59 @@ class OllamaChatGUI(QMainWindow):
         self.conversation_history.append({"role": "assistant", "content": message})
         
         # Scroll to the bottom
-        self.smooth_scroll_to_bottom()
+        self.snap_to_bottom()
         
         return bubble
     
     def update_streaming_bubble(self, new_chunk):
         """Update the content of the streaming bubble with new text"""
         if self.current_streaming_bubble:
-            # Get the current content from conversation history
-            current_content = self.conversation_history[-1]["content"]
+            # Update the existing bubble in place - it accumulates the text, and the
+            # history entry is filled in by finish_streaming_bubble
+            self.current_streaming_bubble.append_text(new_chunk)
             
-            # Add the new chunk
-            updated_content = current_content + new_chunk
-            
-            # Update conversation history
-            self.conversation_history[-1]["content"] = updated_content
-            
-            # Create a new bubble with the updated content
-            new_bubble = ChatBubble(updated_content, False)
-            
-            # Replace the old bubble
-            layout_index = self.chat_layout.indexOf(self.current_streaming_bubble)
-            if layout_index >= 0:
-                # Remove old bubble
-                self.chat_layout.removeWidget(self.current_streaming_bubble)
-                self.current_streaming_bubble.deleteLater()
-                
-                # Add new bubble at same position
-                self.chat_layout.insertWidget(layout_index, new_bubble)
-                self.current_streaming_bubble = new_bubble
-            
-            # Scroll to the bottom
-            self.smooth_scroll_to_bottom()
+            # Scroll to the bottom, coalescing scrolls for chunks that arrive close together
+            if not self.scroll_timer.isActive():
+                self.scroll_timer.start()
         else:
             # If no streaming bubble exists yet, create one
             self.add_streaming_bubble(new_chunk, False)
-            
-    def handle_streaming_chunk(self, chunk):
-        """Handle a streaming chunk from the API"""
-        print(f"Received streaming chunk: {len(chunk)} chars")
+    
+    def finish_streaming_bubble(self):
+        """Render the completed streaming response with the full markdown pipeline"""
+        bubble = self.current_streaming_bubble
+        if bubble:
+            content = bubble.message
+            self.conversation_history[-1]["content"] = content
+            bubble.set_text(content)
+            self.snap_to_bottom()
+    
+    @pyqtSlot()
+    def handle_streaming_chunk(self):
+        """Schedule a flush once the request thread has queued streamed text"""
+        if self.sender() is not self.worker:
+            return
+        
+        if not self.chunk_flush_timer.isActive():
+            self.chunk_flush_timer.start()
+    
+    @pyqtSlot()
+    def flush_streaming_chunks(self):
+        """Apply all streamed text queued by the request thread in a single update"""
+        self.chunk_flush_timer.stop()
+        if self.worker is None:
+            return
+        
+        chunk = self.worker.take_stream_text()
+        if not chunk:
+            return
         
         if self.current_streaming_bubble:
             self.update_streaming_bubble(chunk)
         else:
             self.add_streaming_bubble(chunk, False)
     
+    @pyqtSlot()
     def show_model_dialog(self):
         """Show dialog for selecting a model"""
         dialog = ModelSelectionDialog(self, self.api_url)
@@ -1468,30 +1909,26 @@ class OllamaChatGUI(QMainWindow):
     
     def add_message_bubble(self, message, is_user=False):
         """Add a message bubble to the chat history"""
-        # Check if this is the first message
-        first_message = len(self.conversation_history) == 0
-        
         # If this is the first message, clear the welcome screen with animation
-        if first_message:
-            # Clear existing widgets from chat layout
+        if self.is_empty_conversation:
+            self.is_empty_conversation = False
+            
+            # Clear existing widgets from chat layout, keeping the welcome widget for reuse
             while self.chat_layout.count():
                 item = self.chat_layout.takeAt(0)
-                if item.widget():
-                    widget = item.widget()
-                    # Create fade-out animation
-                    fade_anim = QPropertyAnimation(widget, b"windowOpacity")
-                    fade_anim.setDuration(200)
-                    fade_anim.setStartValue(1.0)
-                    fade_anim.setEndValue(0.0)
-                    fade_anim.start()
-                    # Schedule widget deletion after animation
-                    QTimer.singleShot(200, widget.deleteLater)
+                widget = item.widget()
+                if widget is self.welcome_widget:
+                    widget.hide()
+                elif isinstance(widget, ChatBubble):
+                    self.release_bubble(widget)
+                elif widget:
+                    widget.deleteLater()
             
             # Reset input margins back to original when we have messages
             self.input_layout.setContentsMargins(*self.original_input_margins)
         
         # Add the message bubble
-        bubble = ChatBubble(message, is_user)
+        bubble = self.acquire_bubble(message, is_user)
         
         # Animate the bubble appearance
         bubble.setWindowOpacity(0.0)
@@ -1507,6 +1944,13 @@ class OllamaChatGUI(QMainWindow):
         # Scroll to the bottom with animation
         QTimer.singleShot(100, self.smooth_scroll_to_bottom)
     
+    @pyqtSlot()
+    def snap_to_bottom(self):
+        """Jump straight to the bottom of the chat - used while a response is streaming"""
+        scrollbar = self.scroll_area.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+    
+    @pyqtSlot()
     def smooth_scroll_to_bottom(self):
         """Smoothly scroll to the bottom of the chat"""
         scrollbar = self.scroll_area.verticalScrollBar()
@@ -1519,6 +1963,31 @@ class OllamaChatGUI(QMainWindow):
         scroll_anim.setEasingCurve(QEasingCurve.OutCubic)
         scroll_anim.start()
     
+    def cancel_request(self):
+        """Stop the request still in flight, keeping what it streamed so far"""
+        worker = self.worker
+        if worker is None:
+            return
+        
+        worker.cancel()
+        self.thread.wait(200)
+        
+        # Render the partial response, then drop the worker so its late signals are ignored
+        self.flush_streaming_chunks()
+        self.finish_streaming_bubble()
+        self.current_streaming_bubble = None
+        self.worker = None
+        self.set_busy(False)
+    
+    def set_busy(self, busy):
+        """Show the thinking state on the send button while a request is running"""
+        if self.send_btn is None:
+            return
+        
+        self.send_btn.setEnabled(not busy)
+        self.send_btn.setIcon(self.busy_icon if busy else self.send_icon)
+    
+    @pyqtSlot()
     def send_message(self):
         """Send a message to the Ollama API"""
         try:
@@ -1541,6 +2010,13 @@ class OllamaChatGUI(QMainWindow):
                     self.add_message_bubble("Please select a valid model first.", is_user=False)
                     return
             
+            # Only one request runs at a time, so stop the previous one first
+            self.cancel_request()
+            
+            # Read the request settings once for the rest of the send
+            model, api_url = self.current_model, self.api_url
+            system_prompt, use_streaming = self.system_prompt, self.use_streaming
+            
             # Clear input field
             self.message_input.clear()
             
@@ -1549,131 +2025,157 @@ class OllamaChatGUI(QMainWindow):
             self.conversation_history.append({"role": "user", "content": message})
             
             # Change send button to show thinking state
-            if hasattr(self, 'send_btn'):
-                self.send_btn.setEnabled(False)
-                self.send_btn.setText("⏳")
+            self.set_busy(True)
             
-            print(f"Creating OllamaThread with model={self.current_model}, api_url={self.api_url}")
-            print(f"System prompt is {'set' if self.system_prompt else 'not set'}")
-            print(f"Streaming is {self.use_streaming}")
+            logger.debug("Creating OllamaWorker with model=%s, api_url=%s", model, api_url)
+            logger.debug("System prompt is %s", "set" if system_prompt else "not set")
+            logger.debug("Streaming is %s", use_streaming)
             
-            # Reset streaming bubble if using streaming
-            if self.use_streaming:
-                self.current_streaming_bubble = None
+            # Reset streaming bubble
+            self.current_streaming_bubble = None
             
             # Create thread for API request, including system prompt
             try:
-                self.thread = OllamaThread(
-                    self.current_model, 
-                    message, 
-                    self.api_url,
-                    self.system_prompt,
-                    self.use_streaming
-                )
+                thread = self.thread = QThread(self)
+                worker = self.worker = OllamaWorker(model, message, api_url, system_prompt, use_streaming)
+                worker.moveToThread(thread)
                 
-                # Connect signals
-                self.thread.response_received.connect(self.handle_response)
-                self.thread.error_occurred.connect(self.handle_error)
+                # Connect signals, picking the response handler for this request's mode once
+                worker.error_occurred.connect(self.handle_error, Qt.QueuedConnection)
+                if use_streaming:
+                    worker.response_received.connect(self.handle_streaming_response, Qt.QueuedConnection)
+                    worker.streaming_text_available.connect(self.handle_streaming_chunk, Qt.QueuedConnection)
+                else:
+                    worker.response_received.connect(self.handle_response, Qt.QueuedConnection)
                 
-                # Connect streaming signal if using streaming
-                if self.use_streaming:
-                    self.thread.streaming_chunk_received.connect(self.handle_streaming_chunk)
+                # Run the request once the thread starts, then shut the thread down and clean up.
+                # The worker is freed when self.worker moves on, so sender() checks stay valid.
+                thread.started.connect(worker.start_request)
+                worker.finished.connect(thread.quit)
+                thread.finished.connect(thread.deleteLater)
                 
                 # Start the thread
-                print("Starting OllamaThread...")
-                self.thread.start()
-                print("OllamaThread started successfully")
+                logger.debug("Starting OllamaWorker thread...")
+                thread.start()
+                logger.debug("OllamaWorker thread started successfully")
                 
             except Exception as thread_error:
-                print(f"Error creating or starting thread: {str(thread_error)}")
-                import traceback
+                logger.error("Error creating or starting thread: %s", thread_error)
                 traceback.print_exc()
                 self.add_message_bubble(f"Error: Could not start request: {str(thread_error)}", is_user=False)
                 
                 # Reset send button
-                if hasattr(self, 'send_btn'):
-                    self.send_btn.setEnabled(True)
-                    self.send_btn.setText("▶")
+                self.set_busy(False)
                 
         except Exception as e:
-            print(f"Error in send_message: {str(e)}")
-            import traceback
+            logger.error("Error in send_message: %s", e)
             traceback.print_exc()
             self.add_message_bubble(f"Error: {str(e)}", is_user=False)
             
             # Try to reset the send button if there was an error
-            try:
-                if hasattr(self, 'send_btn'):
-                    self.send_btn.setEnabled(True)
-                    self.send_btn.setText("▶")
-            except:
-                pass
+            self.set_busy(False)
     
-    def handle_response(self, response):
-        """Handle response from Ollama API"""
+    @pyqtSlot(str)
+    def handle_streaming_response(self, response):
+        """Handle the end of a streamed response from Ollama API"""
+        # Ignore a request that was cancelled by a newer one
+        if self.sender() is not self.worker:
+            return
+        
         try:
-            print(f"Received response from Ollama: {len(response)} characters")
+            logger.debug("Received response from Ollama: %d characters", len(response))
             
-            # If we're using streaming and already have a bubble, just finalize it
-            if self.use_streaming and self.current_streaming_bubble:
-                # Reset the streaming bubble
+            # Apply any chunks still waiting for the flush timer
+            self.flush_streaming_chunks()
+            
+            if self.current_streaming_bubble:
+                # Render the final content, then reset the streaming bubble
+                self.finish_streaming_bubble()
                 self.current_streaming_bubble = None
             else:
-                # Add the response to chat
+                # Nothing was streamed, so show the response as a regular message
                 self.add_message_bubble(response)
                 self.conversation_history.append({"role": "assistant", "content": response})
             
             # Reset send button
-            if hasattr(self, 'send_btn'):
-                self.send_btn.setEnabled(True)
-                self.send_btn.setText("▶")
+            self.set_busy(False)
+            self.worker = None
+                    
+        except Exception as e:
+            logger.error("Error in handle_streaming_response: %s", e)
+            traceback.print_exc()
+    
+    @pyqtSlot(str)
+    def handle_response(self, response):
+        """Handle a complete, non-streamed response from Ollama API"""
+        # Ignore a request that was cancelled by a newer one
+        if self.sender() is not self.worker:
+            return
+        
+        try:
+            logger.debug("Received response from Ollama: %d characters", len(response))
+            
+            # Add the response to chat
+            self.add_message_bubble(response)
+            self.conversation_history.append({"role": "assistant", "content": response})
+            
+            # Reset send button
+            self.set_busy(False)
+            self.worker = None
                     
         except Exception as e:
-            print(f"Error in handle_response: {str(e)}")
-            import traceback
+            logger.error("Error in handle_response: %s", e)
             traceback.print_exc()
     
+    @pyqtSlot(str)
     def handle_error(self, error_message):
         """Handle error from Ollama API"""
+        # Ignore a request that was cancelled by a newer one
+        if self.sender() is not self.worker:
+            return
+        
         try:
-            print(f"Error from Ollama API: {error_message}")
+            logger.warning("Error from Ollama API: %s", error_message)
+            
+            # Show whatever was streamed before the error
+            self.flush_streaming_chunks()
+            self.finish_streaming_bubble()
             
             self.add_message_bubble(f"Error: {error_message}")
             
-            # Reset streaming bubble if using streaming
-            if self.use_streaming:
-                self.current_streaming_bubble = None
+            # Reset streaming bubble
+            self.current_streaming_bubble = None
             
             # Reset send button
-            if hasattr(self, 'send_btn'):
-                self.send_btn.setEnabled(True)
-                self.send_btn.setText("▶")
+            self.set_busy(False)
+            self.worker = None
                     
         except Exception as e:
-            print(f"Error in handle_error: {str(e)}")
-            import traceback
+            logger.error("Error in handle_error: %s", e)
             traceback.print_exc()
 
 
 if __name__ == "__main__":
+    # Show warnings and errors; switch to logging.DEBUG to trace requests
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    
     try:
-        app = QApplication(sys.argv)
-        app.setStyle("Fusion")  # Use Fusion style for consistent look across platforms
+        # Enable high DPI scaling for better text rendering - only honoured before QApplication exists
+        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
         
-        # Enable high DPI scaling for better text rendering
-        app.setAttribute(Qt.AA_UseHighDpiPixmaps)
-        app.setAttribute(Qt.AA_EnableHighDpiScaling)
+        # Merge bursts of mouse-move and similar events so fast streaming keeps up
+        QApplication.setAttribute(Qt.AA_CompressHighFrequencyEvents, True)
         
-        # Set application-wide attributes for antialiasing
-        app.setDesktopSettingsAware(False)
+        app = QApplication(sys.argv)
+        app.setStyle("Fusion")  # Use Fusion style for consistent look across platforms
         
-        print("Starting Ollama Chat GUI...")
+        logger.info("Starting Ollama Chat GUI...")
         window = OllamaChatGUI()
-        print("Window created, showing application...")
+        logger.info("Window created, showing application...")
         window.show()
         sys.exit(app.exec_())
     except Exception as e:
-        print(f"Error starting application: {str(e)}")
-        import traceback
+        logger.error("Error starting application: %s", e)
         traceback.print_exc()
         input("Press Enter to exit...")